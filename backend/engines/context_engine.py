@@ -1,12 +1,26 @@
 #Context Engine - RAG-based question answering
 
+import asyncio
 import os
+import re
+import threading
+from collections import ChainMap
 from pathlib import Path
-from openai import OpenAI
+import httpx
+from openai import AsyncOpenAI
 import chromadb
 from chromadb.utils import embedding_functions
 from dotenv import load_dotenv
+from config import EMBEDDING_MODEL, EMBEDDING_DIMENSIONS
 from engines.mood_engine import MoodEngine
+from engines.semantic_cache import SemanticCache
+
+#FAISS is optional - fall back to ChromaDB retrieval when it (or a built
+#index) isn't available
+try:
+    from vectorstore.faiss_store import FaissStore
+except ImportError:
+    FaissStore = None
 
 load_dotenv()
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
@@ -14,6 +28,145 @@ OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 BASE_DIR = Path(__file__).resolve().parents[2]
 CHROMA_DIR = BASE_DIR / "chroma_db"
 
+#Static system prompt, byte-identical on every request so OpenAI's
+#automatic prompt caching can reuse the prefix across calls. All dynamic
+#content (calendar status, retrieved docs, query) goes in the user message.
+SYSTEM_PROMPT = """You are Aaran's digital twin, representing Aaran in professional contexts.
+
+Rules:
+1. Answer questions about Aaran's background, experience, projects, interests, and availability using the provided context and LIVE calendar data - don't make things up
+2. Speak in FIRST PERSON as if you ARE Aaran ("I", "my", "me")
+3. Be conversational, friendly, and authentic
+
+PRIVACY (strictly enforced): only share professional/work information (9 AM - 5 PM weekdays). Never share personal plans - weekends, evenings, vacations, personal appointments. If asked about personal time, respond: "I'm only able to share professional availability and work-related information. For personal matters, please reach out to Aaran directly."
+
+Keep responses concise but informative (2-4 sentences for simple questions, more for complex ones)."""
+
+#Availability-style questions get 1-2 sentence answers, so cap their output
+#budget tighter than background/project questions. Bounds worst-case
+#time-to-last-token when the model drifts verbose.
+_AVAILABILITY_RE = re.compile(
+    r"\b(availab\w*|meeting\w*|free|busy|schedule|calendar|when|reach)\b",
+    re.IGNORECASE,
+)
+
+
+def _max_tokens_for(query: str) -> int:
+    """Pick the completion budget based on a cheap query classification."""
+    return 120 if _AVAILABILITY_RE.search(query) else 500
+
+
+#Prompt templates parsed once at import; per call we only substitute values
+#via format_map instead of rebuilding the strings from f-string pieces
+_CAL_TPL = """[CURRENT STATUS - LIVE FROM GOOGLE CALENDAR]
+- Currently in a meeting: {in_meeting_label}
+- Availability: {availability}
+- Meetings remaining today: {meetings_remaining}
+- Total meetings today: {meeting_count}
+- Energy level: {energy_estimate}
+- Best time to reach: {suggested_wait_time}
+- Summary: {context_summary}"""
+
+_USER_TPL = """Here is context about Aaran:
+
+{context_string}
+
+---
+
+Question: {query}
+
+Answer as Aaran (first person):"""
+
+#Fallback values so a sparse mood status never KeyErrors the template
+_MOOD_DEFAULTS = {
+    "availability": "unknown",
+    "meetings_remaining": 0,
+    "meeting_count": 0,
+    "energy_estimate": "unknown",
+    "suggested_wait_time": "unknown",
+    "context_summary": "",
+}
+
+#Process-wide singletons for the expensive clients.
+#Building a PersistentClient loads the HNSW index from disk and the OpenAI
+#clients each own an HTTP connection pool, so every ContextEngine shares
+#one set instead of paying that setup cost per instance.
+_clients_lock = threading.Lock()
+_clients: dict | None = None
+
+
+def _get_clients() -> dict:
+    """Lazily build (once) and return the shared OpenAI/ChromaDB clients."""
+    global _clients
+    if _clients is None:
+        with _clients_lock:
+            if _clients is None:  #Double-checked so only one thread builds them
+                #Explicit pooled transport with keep-alive: chat + embedding
+                #requests all reuse warm TLS connections to api.openai.com
+                #instead of paying a fresh handshake (~100-300ms) per call
+                http_client = httpx.AsyncClient(
+                    timeout=30.0,
+                    limits=httpx.Limits(
+                        max_connections=64,
+                        max_keepalive_connections=32,
+                        keepalive_expiry=30.0
+                    )
+                )
+                openai_client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+                embedding_fn = embedding_functions.OpenAIEmbeddingFunction(
+                    api_key=OPENAI_API_KEY,
+                    model_name=EMBEDDING_MODEL,
+                    dimensions=EMBEDDING_DIMENSIONS
+                )
+                chroma_client = chromadb.PersistentClient(path=str(CHROMA_DIR))
+                collection = chroma_client.get_collection(
+                    name="profile",
+                    embedding_function=embedding_fn
+                )
+                #Prefer the FAISS index built by the ingest script - exact
+                #in-process search with no SQLite round-trips
+                faiss_store = None
+                if FaissStore is not None and FaissStore.available():
+                    faiss_store = FaissStore()
+                _clients = {
+                    "openai_client": openai_client,
+                    "embedding_fn": embedding_fn,
+                    "chroma_client": chroma_client,
+                    "collection": collection,
+                    "faiss_store": faiss_store,
+                }
+    return _clients
+
+
+async def embed_texts(client: AsyncOpenAI, texts: list[str], batch_size: int = 256,
+                      max_concurrency: int = 5) -> list[list[float]]:
+    """
+    Embed many texts with batched OpenAI requests.
+
+    The /v1/embeddings endpoint accepts arrays of inputs (up to 2048), so
+    one request embeds a whole batch instead of paying an HTTP round-trip
+    per text. Batches are sent concurrently, bounded by max_concurrency so
+    we stay inside OpenAI rate limits. This is the one batching
+    implementation for the project - the engine method below and the
+    ingest script both call it.
+    """
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    semaphore = asyncio.Semaphore(max_concurrency)  #Max concurrent in-flight requests
+
+    async def embed_batch(batch: list[str]) -> list[list[float]]:
+        async with semaphore:
+            response = await client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                dimensions=EMBEDDING_DIMENSIONS,
+                input=batch
+            )
+            return [item.embedding for item in response.data]
+
+    results = await asyncio.gather(*(embed_batch(b) for b in batches))
+
+    #Flatten per-batch results back into one list, order preserved
+    return [embedding for batch in results for embedding in batch]
+
 
 class ContextEngine:
     """
@@ -21,103 +174,102 @@ class ContextEngine:
     """
 
     def __init__(self):
-        self.openai_client = OpenAI(api_key=OPENAI_API_KEY)
-        self.embedding_fn = embedding_functions.OpenAIEmbeddingFunction(
-            api_key=OPENAI_API_KEY,
-            model_name="text-embedding-3-small"
-        )
-        self.chroma_client = chromadb.PersistentClient(path=str(CHROMA_DIR))
-        self.collection = self.chroma_client.get_collection(
-            name="profile",
-            embedding_function=self.embedding_fn
-        )
+        clients = _get_clients()
+        self.openai_client = clients["openai_client"]
+        self.embedding_fn = clients["embedding_fn"]
+        self.chroma_client = clients["chroma_client"]
+        self.collection = clients["collection"]
+        self.faiss_store = clients["faiss_store"]
         self.mood_engine = MoodEngine()
+        self.semantic_cache = SemanticCache()
 
-    def retrieve(self, query: str, n_results: int = 3) -> list[dict]:
+    async def retrieve(self, query: str, n_results: int = 3, query_embedding: list[float] | None = None) -> list[dict]:
         #Use Vector Search to find relevant documents in ChromaDB based on query
-        results = self.collection.query(query_texts=[query], n_results=n_results)
+        #If the caller already embedded the query (e.g. for the semantic
+        #cache), reuse that instead of letting Chroma call OpenAI again
+        if query_embedding is None:
+            query_embedding = (await asyncio.to_thread(self.embedding_fn, [query]))[0]
+
+        #FAISS path: exact in-process search, no ChromaDB involved
+        if self.faiss_store is not None:
+            return await asyncio.to_thread(
+                self.faiss_store.query, query_embedding, n_results
+            )
+
+        #chromadb is a blocking library, so run the query off the event loop
+        #include= keeps Chroma from materializing fields we never read -
+        #embeddings and distances are dropped since nothing downstream uses them
+        results = await asyncio.to_thread(
+            self.collection.query,
+            query_embeddings=[query_embedding],
+            n_results=n_results,
+            include=["documents", "metadatas"],
+        )
 
         documents = results["documents"][0]
         metadatas = results["metadatas"][0]
-        distances = results["distances"][0]
 
-        retrieved = []
-        for doc, meta, dist in zip(documents, metadatas, distances):
-            retrieved.append({
+        retrieved = [None] * len(documents)
+        for i, (doc, meta) in enumerate(zip(documents, metadatas)):
+            retrieved[i] = {
                 "content": doc,
                 "source": meta.get("source", "unknown"),
-                "score": dist  #Lower = better match
-            })
+            }
         return retrieved
 
-    def generate_response(self, query: str, context_docs: list[dict], history: list[dict] = None) -> dict:
-        #Generate response using GPT API with retrieved context and calendar status
-        mood_status = self.mood_engine.get_status()
-
-        #Build calendar context
-        calendar_context = f"""[CURRENT STATUS - LIVE FROM GOOGLE CALENDAR]
-- Currently in a meeting: {"YES" if mood_status.get("in_meeting") else "NO"}
-- Availability: {mood_status.get("availability", "unknown")}
-- Meetings remaining today: {mood_status.get("meetings_remaining", 0)}
-- Total meetings today: {mood_status.get("meeting_count", 0)}
-- Energy level: {mood_status.get("energy_estimate", "unknown")}
-- Best time to reach: {mood_status.get("suggested_wait_time", "unknown")}
-- Summary: {mood_status.get("context_summary", "")}"""
-
-        #Document context
-        context_parts = [f"[Source: {doc['source']}]\n{doc['content']}" for doc in context_docs]
-        context_string = calendar_context + "\n\n---\n\n" + "\n\n---\n\n".join(context_parts)
-
-        system_prompt = """You are Aaran's digital twin - an AI that represents Aaran in professional contexts.
-
-Your role is to:
-1. Answer questions about Aaran's background, experience, projects, and interests
-2. Answer questions about Aaran's current availability using the LIVE calendar data provided
-3. Speak in FIRST PERSON as if you ARE Aaran (use "I", "my", "me")
-4. Be conversational, friendly, and authentic
-5. Use the provided context - don't make things up
-
-You have access to:
-- Aaran's profile documents (resume, bio, projects, interests, work style)
-- LIVE Google Calendar data (current meeting status, today's schedule)
+    async def embed_texts(self, texts: list[str], batch_size: int = 256) -> list[list[float]]:
+        """
+        Batch-embed texts with the engine's shared OpenAI client.
 
-PRIVACY RULES (strictly enforced):
-- Only share PROFESSIONAL/WORK information (9 AM - 5 PM weekdays)
-- NEVER share personal plans: weekends, evenings, vacations, personal appointments
-- If asked about personal time (weekends, after-hours, personal plans), respond:
-  "I'm only able to share professional availability and work-related information. For personal matters, please reach out to Aaran directly."
-- This protects Aaran's privacy while still being helpful for professional contexts
+        Thin wrapper over the module-level embed_texts for bulk callers
+        that already hold an engine; single-query embedding stays on
+        embedding_fn.
+        """
+        return await embed_texts(self.openai_client, texts, batch_size=batch_size)
 
-When asked about availability or meetings, use the calendar data to give accurate, real-time answers.
-Keep responses concise but informative (2-4 sentences for simple questions, more for complex ones)."""
-
-        user_prompt = f"""Here is context about Aaran:
+    def _build_messages(self, query: str, context_docs: list[dict], mood_status: dict, history: list = None) -> list[dict]:
+        #Assemble the GPT messages array from retrieved context, calendar
+        #status, and conversation history (shared by ask and ask_stream).
+        #History items are anything exposing .role/.content (the routers pass
+        #their pydantic models straight through - no per-request dict rebuild)
 
-{context_string}
+        #Build calendar context - ChainMap layers defaults under the live
+        #status so missing keys fall through instead of raising
+        calendar_context = _CAL_TPL.format_map(ChainMap(
+            {"in_meeting_label": "YES" if mood_status.get("in_meeting") else "NO"},
+            mood_status,
+            _MOOD_DEFAULTS,
+        ))
 
----
-
-Question: {query}
+        #Document context
+        context_parts = [f"[Source: {doc['source']}]\n{doc['content']}" for doc in context_docs]
+        context_string = calendar_context + "\n\n---\n\n" + "\n\n---\n\n".join(context_parts)
 
-Answer as Aaran (first person):"""
+        user_prompt = _USER_TPL.format(context_string=context_string, query=query)
 
-        #Build messages array
-        messages = [{"role": "system", "content": system_prompt}]
+        #Build messages array - the system message is the shared constant
+        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
 
         #Conversation history
         if history:
             for msg in history:
-                role = "assistant" if msg["role"] == "twin" else "user"
-                messages.append({"role": role, "content": msg["content"]})
+                role = "assistant" if msg.role == "twin" else "user"
+                messages.append({"role": role, "content": msg.content})
 
         messages.append({"role": "user", "content": user_prompt})
 
+        return messages
+
+    async def generate_response(self, query: str, context_docs: list[dict], mood_status: dict, history: list = None) -> dict:
+        #Generate response using GPT API with retrieved context and calendar status
+        messages = self._build_messages(query, context_docs, mood_status, history)
+
         #Call GPT
-        response = self.openai_client.chat.completions.create(
+        response = await self.openai_client.chat.completions.create(
             model="gpt-4o-mini",
             messages=messages,
             temperature=0.7,
-            max_tokens=500
+            max_tokens=_max_tokens_for(query)
         )
 
         return {
@@ -125,10 +277,118 @@ Answer as Aaran (first person):"""
             "sources": [doc["source"] for doc in context_docs]
         }
 
-    def ask(self, query: str, history: list[dict] = None) -> dict:
-        """Main entry point: ask a question, get an answer."""
+    async def ask(self, query: str, history: list = None, no_cache: bool = False) -> dict:
+        """
+        Main entry point: ask a question, get an answer.
+
+        Availability-class queries are detected automatically and bypass
+        the semantic cache - their answers embed LIVE calendar state that
+        would otherwise be served stale for the cache TTL. Callers can
+        force the same with no_cache=True.
+        """
         if history is None:
             history = []
 
-        context_docs = self.retrieve(query, n_results=3)
-        return self.generate_response(query, context_docs, history)
+        no_cache = no_cache or _AVAILABILITY_RE.search(query) is not None
+        namespace = SemanticCache.fingerprint(history)
+
+        #Exact repeat of a recent question? O(1) hit, no embedding call needed
+        if not no_cache:
+            cached = self.semantic_cache.get_exact(query, namespace)
+            if cached is not None:
+                return cached
+
+        #Embed the query once - used for the cache lookup now and reusable
+        #for retrieval later
+        query_embedding = (await asyncio.to_thread(self.embedding_fn, [query]))[0]
+
+        #Near-duplicate question? Return the cached answer and skip
+        #retrieval + GPT entirely
+        if not no_cache:
+            cached = self.semantic_cache.get(query_embedding, namespace)
+            if cached is not None:
+                return cached
+
+        #Retrieval and the calendar lookup are independent network calls,
+        #so run them concurrently instead of paying for both sequentially
+        context_docs, mood_status = await asyncio.gather(
+            self.retrieve(query, n_results=3, query_embedding=query_embedding),
+            asyncio.to_thread(self.mood_engine.get_status),
+        )
+        result = await self.generate_response(query, context_docs, mood_status, history)
+
+        #Don't cache answers built from live calendar data - a later
+        #near-duplicate query that slips past the classifier must not get
+        #a stale schedule either
+        if not no_cache:
+            self.semantic_cache.put(query, query_embedding, namespace, result)
+        return result
+
+    async def ask_stream(self, query: str, history: list = None, no_cache: bool = False):
+        """
+        Streaming variant of ask(): yields response text chunks as GPT
+        produces them, so the client sees the first token in ~300ms instead
+        of waiting for the full completion. After the last token it yields
+        one {"sources": [...]} dict so clients can render citations.
+
+        Same caching rules as ask(): availability-class queries bypass the
+        semantic cache so live calendar answers are never served stale.
+        """
+        if history is None:
+            history = []
+
+        no_cache = no_cache or _AVAILABILITY_RE.search(query) is not None
+        namespace = SemanticCache.fingerprint(history)
+
+        #Exact repeat: the full answer is already known, yield it in one chunk
+        if not no_cache:
+            cached = self.semantic_cache.get_exact(query, namespace)
+            if cached is not None:
+                yield cached["response"]
+                yield {"sources": cached["sources"]}
+                return
+
+        query_embedding = (await asyncio.to_thread(self.embedding_fn, [query]))[0]
+
+        #Semantic hit: same deal, skip retrieval + GPT
+        if not no_cache:
+            cached = self.semantic_cache.get(query_embedding, namespace)
+            if cached is not None:
+                yield cached["response"]
+                yield {"sources": cached["sources"]}
+                return
+
+        context_docs, mood_status = await asyncio.gather(
+            self.retrieve(query, n_results=3, query_embedding=query_embedding),
+            asyncio.to_thread(self.mood_engine.get_status),
+        )
+        messages = self._build_messages(query, context_docs, mood_status, history)
+
+        #Call GPT with streaming enabled and relay tokens as they arrive
+        stream = await self.openai_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=messages,
+            temperature=0.7,
+            max_tokens=_max_tokens_for(query),
+            stream=True
+        )
+
+        parts = []
+        async for chunk in stream:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                parts.append(delta)
+                yield delta
+
+        sources = [doc["source"] for doc in context_docs]
+
+        #Cache the assembled response so future near-duplicates skip GPT
+        #(unless it embeds live calendar state, which must stay fresh)
+        if not no_cache:
+            self.semantic_cache.put(query, query_embedding, namespace, {
+                "response": "".join(parts),
+                "sources": sources,
+            })
+
+        #Terminal event: which documents backed the answer
+        yield {"sources": sources}
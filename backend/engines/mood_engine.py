@@ -1,11 +1,18 @@
 # Mood Engine analyzes calendar to determine availability + become "mood-aware"
 
+import time
 from datetime import datetime
-import pytz
-from integrations.google_calendar import get_todays_events, is_authenticated
+from zoneinfo import ZoneInfo
+from integrations.google_calendar import CalEvent, get_todays_events, is_authenticated
 
-#Default timezone
-USER_TIMEZONE = pytz.timezone("America/Los_Angeles")
+#Default timezone (stdlib zoneinfo - faster than pytz and no bundled tzdata)
+USER_TIMEZONE = ZoneInfo("America/Los_Angeles")
+
+#Cache the last status so repeated asks (chat + status panel) within a short
+#window reuse it instead of hitting the Google Calendar API every time.
+#Shared at module level because both the chat and status routers own a MoodEngine.
+STATUS_CACHE_TTL = 60  # seconds
+_status_cache: tuple[float, dict] | None = None  # (monotonic timestamp, status)
 
 class MoodEngine:
     """
@@ -26,6 +33,13 @@ class MoodEngine:
         Returns:
             dict with availability, energy, best_contact, wait_time, summary
         """
+        global _status_cache
+
+        #Serve from cache if the last lookup is still fresh
+        now = time.monotonic()
+        if _status_cache is not None and now - _status_cache[0] < STATUS_CACHE_TTL:
+            return _status_cache[1]
+
         #Calendar auth check
         if not is_authenticated():
             return {
@@ -44,9 +58,12 @@ class MoodEngine:
         #Analyze calendar
         analysis = self._analyze_calendar(events)
 
+        #Cache for subsequent calls within the TTL window
+        _status_cache = (now, analysis)
+
         return analysis
 
-    def _analyze_calendar(self, events: list[dict]) -> dict:
+    def _analyze_calendar(self, events: list[CalEvent]) -> dict:
         """
         Analyze calendar events to determine state.
 
@@ -58,14 +75,16 @@ class MoodEngine:
         - Time of day affects energy estimate
         """
 
-        meeting_count = len(events)
         current_hour = datetime.now(USER_TIMEZONE).hour  # Use user's timezone
+        meeting_count = len(events)
 
-        #Check if in meeting
-        in_meeting = any(event.get("is_now", False) for event in events)
-
-        #Count remaining meetings 
-        meetings_remaining = sum(1 for event in events if not event.get("is_past", False))
+        #Single pass over the events: in-meeting check + remaining count
+        #(attribute access on slotted CalEvents, no dict lookups)
+        in_meeting = False
+        meetings_remaining = 0
+        for event in events:
+            in_meeting |= event.is_now
+            meetings_remaining += not event.is_past
 
         #Availability logic
         if in_meeting:
@@ -0,0 +1,160 @@
+#Semantic Cache - reuse answers for duplicate and near-duplicate questions
+
+import hashlib
+import time
+import numpy as np
+
+#numba is optional: when present, the similarity scan below is JIT-compiled
+#to a fused loop (no temporary score array, early namespace skip); without
+#it the NumPy path gives identical results
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+
+def _best_match_numpy(matrix: np.ndarray, vec: np.ndarray,
+                      mask: np.ndarray, threshold: float) -> int:
+    """Index of the best cosine match at/above threshold within mask, else -1."""
+    scores = matrix @ vec
+    scores[~mask] = -1.0
+    best_idx = int(np.argmax(scores))
+    return best_idx if scores[best_idx] >= threshold else -1
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def _best_match(matrix, vec, mask, threshold):
+        best_idx = -1
+        best_score = threshold
+        for i in range(matrix.shape[0]):
+            if not mask[i]:
+                continue
+            score = 0.0
+            for j in range(matrix.shape[1]):
+                score += matrix[i, j] * vec[j]
+            if score >= best_score:
+                best_idx = i
+                best_score = score
+        return best_idx
+else:
+    _best_match = _best_match_numpy
+
+
+class SemanticCache:
+    """
+    In-memory cache of query embeddings → previous responses.
+
+    Two lookup tiers:
+    1. Exact: sha1 of the normalized query text - O(1) dict hit that costs
+       nothing, checked before the query is even embedded.
+    2. Semantic: cosine similarity of the query embedding against every
+       cached embedding - near-duplicate questions ("what do you do?",
+       "tell me about yourself") hit above the threshold and skip ChromaDB
+       retrieval plus the GPT completion entirely.
+
+    Entries are namespaced by a fingerprint of the conversation history, so
+    a follow-up question never reuses an answer from a different
+    conversation. The cache is bounded: past maxsize, the oldest entries
+    are evicted.
+    """
+
+    def __init__(self, threshold: float = 0.93, ttl: float = 15 * 60, maxsize: int = 512):
+        self.threshold = threshold  #Minimum cosine similarity for a semantic hit
+        self.ttl = ttl              #Seconds before an entry expires
+        self.maxsize = maxsize      #Bound on cached entries
+        #Cached query embeddings as one (N, dim) L2-normalized matrix so a
+        #semantic lookup is a single matrix-vector product
+        self._matrix: np.ndarray | None = None
+        self._entries: list[dict] = []  #Parallel to matrix rows (oldest first)
+        self._exact: dict[str, dict] = {}  #exact_key → entry, for the O(1) tier
+
+    @staticmethod
+    def fingerprint(history: list | None) -> str:
+        """
+        Hash the conversation history into a cache namespace.
+
+        Messages are anything exposing .role/.content (the routers' pydantic
+        models come through as-is).
+        """
+        h = hashlib.sha1()
+        for msg in history or []:
+            h.update(msg.role.encode())
+            h.update(msg.content.encode())
+        return h.hexdigest()
+
+    @staticmethod
+    def _exact_key(query: str, namespace: str) -> str:
+        return hashlib.sha1(query.strip().lower().encode()).hexdigest() + namespace
+
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vec = np.asarray(embedding, dtype=np.float32)
+        return vec / np.linalg.norm(vec)
+
+    def _rebuild_exact(self):
+        self._exact = {e["exact_key"]: e for e in self._entries}
+
+    def _prune(self):
+        #Drop expired entries (and their matrix rows)
+        if not self._entries:
+            return
+        now = time.monotonic()
+        keep = [i for i, e in enumerate(self._entries) if now - e["timestamp"] < self.ttl]
+        if len(keep) == len(self._entries):
+            return
+        self._entries = [self._entries[i] for i in keep]
+        #ascontiguousarray keeps rows laid out flat for the scan kernel
+        self._matrix = np.ascontiguousarray(self._matrix[keep]) if keep else None
+        self._rebuild_exact()
+
+    def get_exact(self, query: str, namespace: str) -> dict | None:
+        """
+        O(1) lookup for a byte-identical (normalized) repeat of a query.
+
+        Cheap enough to check before paying for the query embedding.
+        """
+        entry = self._exact.get(self._exact_key(query, namespace))
+        if entry is None or time.monotonic() - entry["timestamp"] >= self.ttl:
+            return None
+        return entry["response"]
+
+    def get(self, embedding, namespace: str) -> dict | None:
+        """Return the cached response for the closest matching query, or None."""
+        self._prune()
+        if self._matrix is None:
+            return None
+
+        #One pass over every cached embedding = cosine similarities; the
+        #kernel also applies the namespace mask so the Python-level loop
+        #over entries is gone
+        mask = np.fromiter(
+            (e["namespace"] == namespace for e in self._entries),
+            dtype=np.bool_, count=len(self._entries)
+        )
+        best_idx = _best_match(self._matrix, self._normalize(embedding),
+                               mask, np.float32(self.threshold))
+
+        if best_idx == -1:
+            return None
+        return self._entries[best_idx]["response"]
+
+    def put(self, query: str, embedding, namespace: str, response: dict):
+        """Cache a response under its query text and embedding."""
+        row = self._normalize(embedding)[None, :]
+        self._matrix = row if self._matrix is None else np.vstack([self._matrix, row])
+        entry = {
+            "exact_key": self._exact_key(query, namespace),
+            "namespace": namespace,
+            "timestamp": time.monotonic(),
+            "response": response,
+        }
+        self._entries.append(entry)
+        self._exact[entry["exact_key"]] = entry
+
+        #Evict oldest entries once over capacity
+        if len(self._entries) > self.maxsize:
+            overflow = len(self._entries) - self.maxsize
+            self._entries = self._entries[overflow:]
+            self._matrix = self._matrix[overflow:]
+            self._rebuild_exact()
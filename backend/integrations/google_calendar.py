@@ -1,8 +1,12 @@
 # Google Calendar Integration
 
 import os
+import threading
+import orjson
+from dataclasses import dataclass
 from datetime import datetime, timedelta
 from pathlib import Path
+from zoneinfo import ZoneInfo
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
 from googleapiclient.discovery import build
@@ -28,6 +32,25 @@ SCOPES = [
 #Store OAuth token
 TOKEN_PATH = Path(__file__).resolve().parents[2] / "token.json"
 
+#User's timezone for day-boundary math, instantiated once at import.
+#Aware datetimes emit the RFC3339 offset natively via isoformat().
+USER_TZ = ZoneInfo("America/Los_Angeles")
+
+
+@dataclass(slots=True)
+class CalEvent:
+    """
+    One calendar event, slimmed down to what the mood engine needs.
+
+    slots=True makes attribute access a fixed-offset load instead of a
+    dict lookup, and drops the per-instance __dict__.
+    """
+    summary: str
+    start: str
+    end: str
+    is_now: bool = False
+    is_past: bool = False
+
 #OAuth Flow:
 def get_oauth_flow() -> Flow:
     """
@@ -108,14 +131,24 @@ def exchange_code_for_tokens(code: str) -> dict:
         "scopes": credentials.scopes,
     }
 
-    # Write tokens to file
-    import json
-    with open(TOKEN_PATH, "w") as f:
-        json.dump(token_data, f)
+    # Write tokens to file (orjson emits bytes, so open in binary mode)
+    with open(TOKEN_PATH, "wb") as f:
+        f.write(orjson.dumps(token_data))
+
+    # Drop the cached credentials so the next call picks up the new tokens
+    global _creds_cache
+    _creds_cache = None
 
     return token_data
 
 
+# Cached Credentials keyed by token.json mtime, so the hot auth paths
+# (every /api/chat, every /auth/status poll) don't re-read and re-parse the
+# file per call. mtime -1 marks env-var-sourced credentials, which can't
+# change while the process runs.
+_creds_cache: tuple[int, Credentials] | None = None
+
+
 def get_credentials() -> Credentials | None:
     """
     Load saved credentials from token.json OR from GOOGLE_TOKEN_JSON env var.
@@ -124,20 +157,30 @@ def get_credentials() -> Credentials | None:
     1. GOOGLE_TOKEN_JSON environment variable (for deployed environments)
     2. token.json file (for local development)
 
+    The parsed Credentials are cached until token.json's mtime changes, so
+    repeated calls cost one stat() instead of a read + JSON parse.
+
     Returns:
         Credentials object if tokens exist and are valid, None otherwise
     """
-    import json
+    global _creds_cache
 
     # Check environment variable first (for Render deployment)
     token_json_env = os.getenv("GOOGLE_TOKEN_JSON")
     if token_json_env:
-        token_data = json.loads(token_json_env)
-    elif TOKEN_PATH.exists():
-        with open(TOKEN_PATH, "r") as f:
-            token_data = json.load(f)
+        if _creds_cache is not None and _creds_cache[0] == -1:
+            return _creds_cache[1]
+        token_data = orjson.loads(token_json_env)
+        mtime_ns = -1
     else:
-        return None
+        try:
+            mtime_ns = TOKEN_PATH.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        if _creds_cache is not None and _creds_cache[0] == mtime_ns:
+            return _creds_cache[1]
+        with open(TOKEN_PATH, "rb") as f:
+            token_data = orjson.loads(f.read())
 
     # Create Credentials object from saved data
     credentials = Credentials(
@@ -149,6 +192,7 @@ def get_credentials() -> Credentials | None:
         scopes=token_data["scopes"],
     )
 
+    _creds_cache = (mtime_ns, credentials)
     return credentials
 
 
@@ -158,42 +202,79 @@ def is_authenticated() -> bool:
     return creds is not None
 
 
-def get_todays_events() -> list[dict]:
+#Cache built API service objects keyed by (api, version), PER THREAD.
+#build() parses a multi-hundred-KB discovery document and reflects a client
+#class on every call - caching saves ~50ms on each calendar/slides/drive hit.
+#The cache is thread-local because each service wraps an httplib2.Http,
+#which is not thread-safe: the slides fetchers run execute() from up to 8
+#worker threads at once, and sharing one service across them can corrupt
+#connections/responses. Thread pools reuse their threads, so each worker
+#still pays the build cost only once.
+_services = threading.local()
+
+
+def get_service(api: str, version: str):
+    """
+    Return a cached googleapiclient service for the given API.
+
+    Each thread gets its own service (httplib2 is not thread-safe), rebuilt
+    only when the access token has changed (e.g. after a refresh or a new
+    login), since the service object embeds the credentials.
+
+    Args:
+        api: API name, e.g. "calendar", "drive", "slides"
+        version: API version, e.g. "v3"
+
+    Returns:
+        A googleapiclient service object, or None if not authenticated
+    """
+    credentials = get_credentials()
+    if credentials is None:
+        return None
+
+    cache = getattr(_services, "by_key", None)
+    if cache is None:
+        cache = _services.by_key = {}
+
+    key = (api, version)
+    cached = cache.get(key)
+    if cached is not None and cached[0] == credentials.token:
+        return cached[1]
+
+    service = build(api, version, credentials=credentials, cache_discovery=False)
+    cache[key] = (credentials.token, service)
+    return service
+
+
+def get_todays_events() -> list[CalEvent]:
     """
     Fetch all calendar events for today.
 
     Returns:
-        List of events, each with: summary, start, end, is_now
+        List of CalEvent objects with: summary, start, end, is_now, is_past
 
     Example return:
         [
-            {"summary": "Team Standup", "start": "09:00", "end": "09:30", "is_now": False},
-            {"summary": "1:1 with Manager", "start": "14:00", "end": "15:00", "is_now": True},
+            CalEvent(summary="Team Standup", start="09:00", end="09:30", is_now=False, is_past=True),
+            CalEvent(summary="1:1 with Manager", start="14:00", end="15:00", is_now=True, is_past=False),
         ]
     """
-    credentials = get_credentials()
+    # Get the (cached) Google Calendar API service
+    # 'calendar' = the API name, 'v3' = API version
+    service = get_service("calendar", "v3")
 
-    if not credentials:
+    if not service:
         return []  # Not authenticated yet
 
-    # Build the Google Calendar API service
-    # 'calendar' = the API name, 'v3' = API version
-    service = build("calendar", "v3", credentials=credentials)
-
-    # Get today's date range (midnight to midnight in LOCAL time)
-    now = datetime.now()
-    start_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    # Get today's date range (midnight to midnight in the user's timezone)
+    # Google Calendar API needs timezone info to filter correctly; aware
+    # datetimes include the RFC3339 offset in isoformat(), so no manual
+    # time.timezone/time.daylight offset math (and no DST edge cases)
+    start_of_day = datetime.now(USER_TZ).replace(hour=0, minute=0, second=0, microsecond=0)
     end_of_day = start_of_day + timedelta(days=1)
 
-    # Format as RFC3339 with timezone offset
-    # Google Calendar API needs timezone info to filter correctly
-    import time
-    offset = time.timezone if time.daylight == 0 else time.altzone
-    offset_hours = -offset // 3600
-    offset_str = f"{offset_hours:+03d}:00"
-
-    time_min = start_of_day.isoformat() + offset_str
-    time_max = end_of_day.isoformat() + offset_str
+    time_min = start_of_day.isoformat()
+    time_max = end_of_day.isoformat()
 
     # Call the Calendar API
     events_result = service.events().list(
@@ -249,12 +330,12 @@ def get_todays_events() -> list[dict]:
             is_now = False
             is_past = False
 
-        formatted_events.append({
-            "summary": event.get("summary", "No title"),
-            "start": start_str,
-            "end": end_str,
-            "is_now": is_now,
-            "is_past": is_past,
-        })
+        formatted_events.append(CalEvent(
+            summary=event.get("summary", "No title"),
+            start=start_str,
+            end=end_str,
+            is_now=is_now,
+            is_past=is_past,
+        ))
 
     return formatted_events
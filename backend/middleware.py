@@ -0,0 +1,90 @@
+# Custom ASGI middleware for the backend app
+
+import gzip
+
+from starlette.datastructures import Headers, MutableHeaders
+
+
+class SelectiveGZipMiddleware:
+    """
+    GZip responses over minimum_size, decided per response by content type.
+
+    Starlette's stock GZipMiddleware writes streamed chunks into a GzipFile
+    without flushing, so the tiny per-token `data:` events from
+    /api/chat/stream sit in zlib's buffer and reach gzip-accepting clients
+    (all browsers) in delayed bursts - erasing exactly the first-token
+    latency the SSE endpoint exists to deliver. This middleware inspects
+    the response's Content-Type instead: text/event-stream (and any other
+    chunked response) passes through untouched, while complete bodies of
+    1KB+ - the long JSON answers from /api/chat - are compressed in one
+    shot.
+    """
+
+    def __init__(self, app, minimum_size: int = 1000):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        if "gzip" not in headers.get("Accept-Encoding", ""):
+            await self.app(scope, receive, send)
+            return
+
+        await self.app(scope, receive, _GZipSender(send, self.minimum_size))
+
+
+class _GZipSender:
+    """
+    Send wrapper that holds back http.response.start until the first body
+    message, when there is enough information to choose compression.
+    """
+
+    def __init__(self, send, minimum_size: int):
+        self.send = send
+        self.minimum_size = minimum_size
+        self.initial_message = None
+        self.started = False  #True once the (possibly modified) start was sent
+
+    async def __call__(self, message):
+        if message["type"] == "http.response.start":
+            self.initial_message = message
+            return
+
+        if message["type"] != "http.response.body" or self.started:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = Headers(raw=self.initial_message["headers"])
+
+        #Pass through untouched:
+        #- SSE streams (each event must hit the wire immediately)
+        #- any other chunked/streaming response (same flushing concern)
+        #- already-encoded bodies
+        #- bodies too small to be worth the gzip overhead
+        if (
+            headers.get("Content-Type", "").startswith("text/event-stream")
+            or more_body
+            or "Content-Encoding" in headers
+            or len(body) < self.minimum_size
+        ):
+            self.started = True
+            await self.send(self.initial_message)
+            await self.send(message)
+            return
+
+        #Complete body worth compressing: gzip it and fix up the headers
+        compressed = gzip.compress(body)
+        mutable = MutableHeaders(raw=self.initial_message["headers"])
+        mutable["Content-Encoding"] = "gzip"
+        mutable["Content-Length"] = str(len(compressed))
+        mutable.add_vary_header("Accept-Encoding")
+
+        self.started = True
+        await self.send(self.initial_message)
+        await self.send({"type": "http.response.body", "body": compressed})
@@ -7,7 +7,10 @@ When a user sends a message, this endpoint:
 3. Returns the response to the frontend
 """
 
+import json
+
 from fastapi import APIRouter
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
 #Import context engine
@@ -50,7 +53,7 @@ class ChatResponse(BaseModel):
 
 
 @router.post("/chat", response_model=ChatResponse)
-def chat(req: ChatRequest):
+async def chat(req: ChatRequest):
     """
     Main chat endpoint.
 
@@ -66,14 +69,41 @@ def chat(req: ChatRequest):
     5. Return Response 
     """
 
-    # Convert history to simple list of dicts for the engine
-    history = [{"role": msg.role, "content": msg.content} for msg in req.history]
-
     # Call the context engine's ask() method for RAG
-    result = engine.ask(req.query, history=history)
+    # The engine reads .role/.content off the messages directly, so the
+    # validated pydantic models go through with no conversion pass
+    result = await engine.ask(req.query, history=req.history)
 
     # Return the response
     return ChatResponse(
         response=result["response"],
         sources=result["sources"]
-    )
\ No newline at end of file
+    )
+
+
+@router.post("/chat/stream")
+async def chat_stream(req: ChatRequest):
+    """
+    Streaming chat endpoint (Server-Sent Events).
+
+    POST /api/chat/stream
+    Body: same as /api/chat
+
+    Instead of waiting for the full GPT completion, tokens are pushed to
+    the client as they arrive, followed by the sources and a terminator:
+        data: "Hi, I'm Aaran..."
+        data: {"sources": ["resume.md"]}
+        data: [DONE]
+
+    Tokens are JSON strings and the final sources event is a JSON object,
+    so the client can tell them apart by type. First-token latency matters
+    more than total time for chat UX, and the server stops buffering
+    500-token responses in memory.
+    """
+    async def event_stream():
+        async for event in engine.ask_stream(req.query, history=req.history):
+            # JSON-encode each event so newlines survive SSE framing
+            yield f"data: {json.dumps(event)}\n\n"
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
\ No newline at end of file
@@ -1,6 +1,8 @@
 # Status Endpoint - Returns current availability/mood
 # This powers the "Current State" panel in the UI
 
+import asyncio
+
 from fastapi import APIRouter
 from engines.mood_engine import MoodEngine
 
@@ -9,9 +11,14 @@ router = APIRouter(prefix="/api")
 # Initialize mood engine once
 mood_engine = MoodEngine()
 
+# MoodEngine caches the analyzed status for 60s; this lock single-flights
+# concurrent polls during a cache miss, so a burst of UI refreshes costs one
+# Google Calendar round-trip instead of one per request
+_status_lock = asyncio.Lock()
+
 
 @router.get("/status")
-def get_status():
+async def get_status():
     """
     Get current professional status based on calendar.
 
@@ -27,4 +34,8 @@ def get_status():
             "events": [...]
         }
     """
-    return mood_engine.get_status()
+    # googleapiclient is blocking, so keep the calendar call off the event
+    # loop; the lock makes simultaneous misses wait for the first caller's
+    # result to land in the engine cache instead of duplicating the fetch
+    async with _status_lock:
+        return await asyncio.to_thread(mood_engine.get_status)
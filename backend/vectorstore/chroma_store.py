@@ -1,23 +1,65 @@
 import chromadb
 from chromadb.config import Settings
+from chromadb.utils import embedding_functions
 import os
 
 # Create or load Chroma database
 CHROMA_DIR = os.path.join(os.path.dirname(__file__), "../../chroma_db")
 
+
+def _hnsw_params_for(vector_count: int) -> dict:
+    """
+    Pick HNSW build/search parameters for the expected corpus size.
+
+    Bigger M/ef raise recall but cost memory and distance computations per
+    query; a small corpus gets near-perfect recall from a small graph, so
+    paying for large defaults just slows the /api/chat hot path.
+
+    Note: the build params (M, construction_ef) only take effect when the
+    collection is first created - the ingest script passes the real
+    document count here so a reindex gets the right graph.
+    """
+    if vector_count < 10_000:
+        m, construction_ef, search_ef = 16, 64, 40
+    elif vector_count < 100_000:
+        m, construction_ef, search_ef = 24, 100, 100
+    else:
+        m, construction_ef, search_ef = 32, 128, 200
+    return {
+        "hnsw:space": "cosine",  # Use cosine similarity for retrieval (focused on meaning of document)
+        "hnsw:M": m,
+        "hnsw:construction_ef": construction_ef,
+        "hnsw:search_ef": search_ef,
+    }
+
+
 class ChromaStore:
-    """Wrapper around Chroma for embedding and retrieving documents."""
-    
+    """
+    Wrapper around Chroma for embedding and retrieving documents.
+
+    Uses a local ONNX MiniLM embedder: ~5-15ms per query on CPU, no network
+    round-trip, and zero per-request API cost. Documents added through this
+    store are embedded with the same model, so its collection stays in one
+    vector space - it's kept separate from the OpenAI-embedded "profile"
+    collection the chat engine queries.
+    """
+
     def __init__(self):
         """Initialize Chroma client and collection."""
         # Create persistent Chroma client
         self.client = chromadb.PersistentClient(path=CHROMA_DIR)
-        
-        # Get or create collection named "profile"
+
+        # Explicit local embedder (instead of whatever Chroma defaults to)
+        self.embedding_fn = embedding_functions.ONNXMiniLM_L6_V2()
+
+        # Get or create the locally-embedded collection
         # Collection = database table for storing embeddings
+        # Small-corpus HNSW recipe - the ingest script recreates with the
+        # real document count if the corpus outgrows it
         self.collection = self.client.get_or_create_collection(
-            name="profile",
-            metadata={"hnsw:space": "cosine"}  # Use cosine similarity for retrieval (focused on meaning of document)
+            name="profile_local",
+            embedding_function=self.embedding_fn,
+            metadata=_hnsw_params_for(0)
         )
     
     def add_documents(self, documents: list, metadatas: list = None):
@@ -64,8 +106,12 @@ class ChromaStore:
             for doc, metadata in zip(results["documents"], results["metadatas"]):
                 print(f"Found: {doc} (from {metadata['source']})")
         """
+        # include= lists exactly the fields callers read - without it some
+        # Chroma versions also materialize and return the raw embeddings
+        # (n_results x dim floats of pure overhead per query)
         results = self.collection.query(
             query_texts=[query_text],
-            n_results=n_results
+            n_results=n_results,
+            include=["documents", "metadatas", "distances"]
         )
         return results
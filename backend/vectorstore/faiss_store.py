@@ -0,0 +1,90 @@
+#FAISS Vector Store - in-process exact search over the profile corpus
+
+import json
+from pathlib import Path
+import numpy as np
+import faiss
+
+#The index lives next to the Chroma persistence dir. Chroma stays the
+#source of truth at ingest time; this is the read-optimized serving copy.
+BASE_DIR = Path(__file__).resolve().parents[2]
+INDEX_PATH = BASE_DIR / "chroma_db" / "profile.faiss"
+DOCS_PATH = BASE_DIR / "chroma_db" / "profile_docs.jsonl"
+
+
+class FaissStore:
+    """
+    Exhaustive inner-product search over an fp16 scalar-quantized index.
+
+    For a profile corpus this small, an in-process flat scan avoids
+    Chroma's SQLite metadata round-trips entirely: one normalized
+    matrix-vector product per query, no server, no HNSW approximation.
+    fp16 storage halves the bytes the scan touches.
+
+    Vectors are L2-normalized at build and query time, so inner product
+    equals cosine similarity (higher = better match).
+    """
+
+    def __init__(self):
+        self.index = faiss.read_index(str(INDEX_PATH))
+        #Sidecar file maps FAISS row ids back to document content/metadata
+        with open(DOCS_PATH, "r", encoding="utf-8") as f:
+            self.docs = [json.loads(line) for line in f]
+
+    @staticmethod
+    def available() -> bool:
+        """True if the ingest script has built an index on disk."""
+        return INDEX_PATH.exists() and DOCS_PATH.exists()
+
+    def query(self, query_embedding: list[float], n_results: int = 3) -> list[dict]:
+        """
+        Search for the documents closest to the query embedding.
+
+        Returns:
+            list of dicts with "content", "source", "score" (cosine similarity)
+        """
+        q = np.asarray(query_embedding, dtype=np.float32)[None, :]
+        faiss.normalize_L2(q)
+
+        scores, ids = self.index.search(q, n_results)
+
+        retrieved = []
+        for score, idx in zip(scores[0], ids[0]):
+            if idx == -1:
+                continue  #Fewer than n_results documents in the index
+            doc = self.docs[idx]
+            retrieved.append({
+                "content": doc["content"],
+                "source": doc.get("source", "unknown"),
+                "score": float(score),
+            })
+        return retrieved
+
+
+def build_index(embeddings: list, documents: list[str], metadatas: list[dict]):
+    """
+    Build and persist the FAISS index plus its docs sidecar.
+
+    Called by scripts/ingest_data.py after the Chroma collection is
+    populated, so serving never touches Chroma.
+
+    Vectors are stored fp16 via a scalar quantizer: half the bytes of
+    float32, so distance scans move half the memory, and the precision
+    loss is far below what retrieval ranking can notice.
+    """
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    faiss.normalize_L2(vectors)
+
+    index = faiss.IndexScalarQuantizer(
+        vectors.shape[1], faiss.ScalarQuantizer.QT_fp16, faiss.METRIC_INNER_PRODUCT
+    )
+    index.train(vectors)  #No-op for fp16, but required by the SQ interface
+    index.add(vectors)
+    faiss.write_index(index, str(INDEX_PATH))
+
+    with open(DOCS_PATH, "w", encoding="utf-8") as f:
+        for doc, meta in zip(documents, metadatas):
+            f.write(json.dumps({
+                "content": doc,
+                "source": (meta or {}).get("source", "unknown"),
+            }) + "\n")
@@ -0,0 +1,136 @@
+#Ingest profile documents via the OpenAI Batch API (50% embedding cost).
+
+"""
+How to use:
+  1. Create a .env file with `OPENAI_API_KEY=your_key_here`
+  2. Install dependencies: `pip install -r backend/requirements.txt`.
+  3. Run: python scripts/ingest_batch.py
+
+This is the offline/cheap counterpart to scripts/ingest_data.py:
+  - Serializes one embedding request per profile document into a JSONL file
+  - Uploads it and creates a Batch job (completion window: 24h, half price)
+  - Polls until the batch completes, then stores the embeddings in ChromaDB
+    and rebuilds the FAISS serving index
+
+Use this for bulk reindexing where turnaround doesn't matter; the online
+chat path keeps using the synchronous embeddings API.
+"""
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from openai import OpenAI
+
+#Reuse paths, file reading, and the FAISS export from the online ingest script
+from ingest_data import (
+    OPENAI_API_KEY,
+    CHROMA_DIR,
+    PROFILE_DIR,
+    read_profile_files,
+    reset_collection_if_dim_changed,
+    build_faiss_index,
+)
+
+import chromadb
+
+#Shared embedding settings (importing ingest_data put backend/ on sys.path)
+from config import EMBEDDING_MODEL, EMBEDDING_DIMENSIONS
+from vectorstore.chroma_store import _hnsw_params_for
+
+POLL_INTERVAL = 60  #Seconds between batch status checks
+
+
+def write_batch_file(documents: list[str], ids: list[str]) -> Path:
+    """Serialize one /v1/embeddings request per document into a batch JSONL file."""
+    path = Path(tempfile.mkstemp(suffix=".jsonl", prefix="embed_batch_")[1])
+    with open(path, "w", encoding="utf-8") as f:
+        for doc_id, text in zip(ids, documents):
+            f.write(json.dumps({
+                "custom_id": doc_id,
+                "method": "POST",
+                "url": "/v1/embeddings",
+                "body": {
+                    "model": EMBEDDING_MODEL,
+                    "dimensions": EMBEDDING_DIMENSIONS,
+                    "input": text,
+                },
+            }) + "\n")
+    return path
+
+
+def run_batch(client: OpenAI, batch_path: Path) -> dict[str, list[float]]:
+    """
+    Upload the batch file, wait for completion, and return {custom_id: embedding}.
+    """
+    #Upload the request file
+    batch_file = client.files.create(file=open(batch_path, "rb"), purpose="batch")
+
+    #Create the batch job
+    batch = client.batches.create(
+        input_file_id=batch_file.id,
+        endpoint="/v1/embeddings",
+        completion_window="24h",
+    )
+    print(f"Created batch {batch.id} (window: 24h). Polling every {POLL_INTERVAL}s...")
+
+    #Poll until the job reaches a terminal state
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(POLL_INTERVAL)
+        batch = client.batches.retrieve(batch.id)
+        print(f"  status: {batch.status}")
+
+    if batch.status != "completed":
+        raise SystemExit(f"Batch {batch.id} ended with status '{batch.status}'")
+
+    #Download and parse the output file
+    output = client.files.content(batch.output_file_id).text
+
+    embeddings = {}
+    for line in output.splitlines():
+        result = json.loads(line)
+        body = result["response"]["body"]
+        embeddings[result["custom_id"]] = body["data"][0]["embedding"]
+    return embeddings
+
+
+def main():
+    print(f"Profile dir: {PROFILE_DIR}")
+    documents, metadatas = read_profile_files(PROFILE_DIR)
+    if not documents:
+        print("No markdown files found. Add resume.md etc. and retry.")
+        return
+
+    ids = [f"doc_{i}" for i in range(len(documents))]
+
+    client = OpenAI(api_key=OPENAI_API_KEY)
+
+    batch_path = write_batch_file(documents, ids)
+    print(f"Wrote {len(documents)} embedding requests to {batch_path}")
+
+    embeddings_by_id = run_batch(client, batch_path)
+
+    #Store in Chroma with the precomputed embeddings (no embedder involved)
+    chroma_client = chromadb.PersistentClient(path=str(CHROMA_DIR))
+
+    #A collection built at a different embedding dimension can't take these
+    #vectors - drop and recreate it (same migration as ingest_data.py)
+    reset_collection_if_dim_changed(chroma_client)
+    collection = chroma_client.get_or_create_collection(
+        name="profile",
+        metadata=_hnsw_params_for(len(documents)),
+    )
+    collection.add(
+        embeddings=[embeddings_by_id[i] for i in ids],
+        documents=documents,
+        metadatas=metadatas,
+        ids=ids,
+    )
+    print(f"Indexed {len(documents)} documents into Chroma at {CHROMA_DIR}")
+
+    #Refresh the FAISS serving index
+    build_faiss_index(collection)
+
+
+if __name__ == "__main__":
+    main()
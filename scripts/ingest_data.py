@@ -8,14 +8,28 @@ How to use:
 
 This script will:
   - Read all `*.md` files in `backend/data/profile/` + slides from Viven AI Google Drive folder
-  - Create ChromaDB 
+  - Create ChromaDB
   - Use OpenAI embeddings to embed each document and store them
+
+Migration note: a Chroma collection is locked to the dimension of its first
+vectors, so changing EMBEDDING_DIMENSIONS (or the embedding model) makes the
+existing collection unusable - add() raises InvalidDimensionException and
+queries from the backend fail. This script detects the mismatch, drops and
+recreates the collection (which also applies the current HNSW params -
+get_or_create_collection ignores metadata for existing collections), and
+re-embeds everything. The sqlite embed cache keys on dimension, so only the
+vectors actually need recomputing; slides need --slides to be re-ingested.
 """
+import asyncio
+import hashlib
 import os
+import sqlite3
 import sys
 import argparse
 from pathlib import Path
 from dotenv import load_dotenv
+import httpx
+import numpy as np
 
 load_dotenv()
 
@@ -30,47 +44,229 @@ if not OPENAI_API_KEY:
 #Set up ChromaDB
 import chromadb
 from chromadb.utils import embedding_functions
+from openai import AsyncOpenAI
+
+#Shared embedding settings so documents land in the same space the engine queries in
+from config import EMBEDDING_MODEL, EMBEDDING_DIMENSIONS
+
+#HNSW sizing helper so the collection is built with params matched to corpus size
+from vectorstore.chroma_store import _hnsw_params_for
+
+#The one batched-embedding implementation, shared with the serving engine
+from engines.context_engine import embed_texts
 
 BASE_DIR = Path(__file__).resolve().parents[1]
 PROFILE_DIR = BASE_DIR / "backend" / "data" / "profile"
 CHROMA_DIR = BASE_DIR / "chroma_db"
 
-#Read from backend/data/profile/*.md 
+#On-disk embedding cache: content hash → vector. Reruns over unchanged
+#documents skip the OpenAI call entirely.
+CACHE_PATH = CHROMA_DIR / "embed_cache.sqlite"
+
+#Precompiled translation table for slide doc-id slugs: space → dash, drop apostrophes
+_SLUG_TABLE = str.maketrans({" ": "-", "'": None})
+
+
+def _open_embed_cache() -> sqlite3.Connection:
+    """Open (creating if needed) the content-hash → embedding sidecar cache."""
+    conn = sqlite3.connect(CACHE_PATH)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS embeddings (sha256 TEXT PRIMARY KEY, dim INT, vec BLOB)"
+    )
+    return conn
+
+#Read from backend/data/profile/*.md
 def read_profile_files(directory: Path):
-    files = sorted(directory.glob("*.md"))
+    #os.scandir gives DirEntry objects with cached stat info (glob stats
+    #every entry again), and a binary read + one decode skips the
+    #TextIOWrapper slow path
+    entries = [e for e in os.scandir(directory) if e.name.endswith(".md")]
+    entries.sort(key=lambda e: e.name)
+
     documents = []
     metadatas = []
-    for f in files:
-        text = f.read_text(encoding="utf-8")
+    for entry in entries:
+        with open(entry.path, "rb") as fh:
+            text = fh.read().decode("utf-8")
         documents.append(text)
-        metadatas.append({"source": f.name}) #Store filename as metadata for retrieval (e.g., "resume.md") (turned off for now)
+        metadatas.append({"source": entry.name}) #Store filename as metadata for retrieval (e.g., "resume.md") (turned off for now)
     return documents, metadatas
 
 
-def main():
-    print(f"Profile dir: {PROFILE_DIR}")
-    documents, metadatas = read_profile_files(PROFILE_DIR)
-    if not documents:
-        print("No markdown files found. Add resume.md etc. and retry.") #Error handling
+def embed_documents(texts: list[str], batch_size: int = 256) -> list[list[float]]:
+    """
+    Batch-embed texts ourselves instead of letting Chroma's embedder do it.
+
+    Unchanged documents come from the on-disk cache (keyed by sha256 of the
+    content), so iterative reruns only pay for what actually changed. The
+    misses go through the engine's shared embed_texts helper: batched
+    requests (the endpoint accepts up to 2048 inputs) with several in
+    flight, so wall time is roughly one round-trip instead of one per
+    document.
+    """
+    async def run(misses: list[str]) -> list[list[float]]:
+        #Pooled keep-alive transport so the parallel batch requests reuse a
+        #few warm TLS connections instead of handshaking per request
+        http_client = httpx.AsyncClient(
+            timeout=60.0,
+            limits=httpx.Limits(max_connections=8, max_keepalive_connections=8)
+        )
+        client = AsyncOpenAI(api_key=OPENAI_API_KEY, http_client=http_client)
+        return await embed_texts(client, misses, batch_size=batch_size, max_concurrency=8)
+
+    conn = _open_embed_cache()
+    hashes = [hashlib.sha256(text.encode()).hexdigest() for text in texts]
+
+    #Check the cache first (dim must match in case EMBEDDING_DIMENSIONS changed)
+    embeddings: list = [None] * len(texts)
+    miss_indices = []
+    for i, h in enumerate(hashes):
+        row = conn.execute("SELECT dim, vec FROM embeddings WHERE sha256=?", (h,)).fetchone()
+        if row is not None and row[0] == EMBEDDING_DIMENSIONS:
+            embeddings[i] = np.frombuffer(row[1], dtype=np.float32).tolist()
+        else:
+            miss_indices.append(i)
+
+    if miss_indices:
+        fresh = asyncio.run(run([texts[i] for i in miss_indices]))
+        for i, embedding in zip(miss_indices, fresh):
+            embeddings[i] = embedding
+            #float32 blob: half the bytes of float64, plenty of precision
+            conn.execute(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                (hashes[i], EMBEDDING_DIMENSIONS, np.asarray(embedding, dtype=np.float32).tobytes()),
+            )
+        conn.commit()
+
+    conn.close()
+    print(f"Embeddings: {len(texts) - len(miss_indices)} cached, {len(miss_indices)} embedded")
+    return embeddings
+
+
+def dedupe_documents(documents: list[str], metadatas: list[dict], ids: list[str]):
+    """
+    Drop documents whose text is byte-identical to an earlier one.
+
+    Template/title slides often repeat verbatim across decks; each
+    duplicate would cost an embedding and an index entry while only adding
+    noise to retrieval. Keeps the first occurrence, preserves order.
+    """
+    seen = set()
+    keep = []
+    for i, text in enumerate(documents):
+        h = hashlib.sha1(text.encode()).digest()
+        if h in seen:
+            continue
+        seen.add(h)
+        keep.append(i)
+
+    if len(keep) != len(documents):
+        print(f"Deduplicated {len(documents) - len(keep)} identical document(s) "
+              f"({len(keep)}/{len(documents)} kept)")
+        documents = [documents[i] for i in keep]
+        metadatas = [metadatas[i] for i in keep]
+        ids = [ids[i] for i in keep]
+    return documents, metadatas, ids
+
+
+def reset_collection_if_dim_changed(client, name: str = "profile"):
+    """
+    Drop the collection if its stored vectors don't match EMBEDDING_DIMENSIONS.
+
+    A Chroma collection is locked to the dimension of its first vectors:
+    after an EMBEDDING_DIMENSIONS change, add() into the old collection
+    raises InvalidDimensionException and backend queries send mismatched
+    query_embeddings. Recreating is the only migration path - and it's also
+    the only way updated HNSW params ever take effect, since
+    get_or_create_collection ignores metadata for existing collections.
+    """
+    try:
+        existing = client.get_collection(name=name)
+    except Exception:
+        return  #No collection yet - nothing to migrate
+
+    #Peek at one stored vector to learn the collection's actual dimension
+    sample = existing.get(limit=1, include=["embeddings"])
+    embeddings = sample.get("embeddings")
+    if embeddings is None or len(embeddings) == 0:
+        return
+    dim = len(embeddings[0])
+    if dim == EMBEDDING_DIMENSIONS:
         return
 
-    #OpenAI embedding function
-    embedding_fn = embedding_functions.OpenAIEmbeddingFunction(
+    print(f"Collection '{name}' holds {dim}-dim vectors but EMBEDDING_DIMENSIONS "
+          f"is {EMBEDDING_DIMENSIONS}; dropping and re-embedding from scratch")
+    client.delete_collection(name=name)
+
+
+def make_embedding_fn():
+    """OpenAI embedding function for the collection (built once, shared)."""
+    return embedding_functions.OpenAIEmbeddingFunction(
         api_key=OPENAI_API_KEY,
-        model_name="text-embedding-3-small"
+        model_name=EMBEDDING_MODEL,
+        dimensions=EMBEDDING_DIMENSIONS
     )
 
-    client = chromadb.PersistentClient(path=str(CHROMA_DIR))
+
+def main(client, embedding_fn):
+    """
+    Ingest the profile docs. Returns the collection for reuse by the
+    slides and FAISS steps, or None if there was nothing to ingest.
+    """
+    print(f"Profile dir: {PROFILE_DIR}")
+
+    #Migrate away from a collection built at a different embedding dimension
+    #(e.g. the pre-Matryoshka 1536-dim index) before touching it
+    reset_collection_if_dim_changed(client)
+
+    documents, metadatas = read_profile_files(PROFILE_DIR)
+    if not documents:
+        print("No markdown files found. Add resume.md etc. and retry.") #Error handling
+        return None
 
     #Create/Get collection and attach embedding function
-    collection = client.get_or_create_collection(name="profile", embedding_function=embedding_fn)
+    #HNSW build params are sized from the document count (only applied on first create)
+    collection = client.get_or_create_collection(
+        name="profile",
+        embedding_function=embedding_fn,
+        metadata=_hnsw_params_for(len(documents)),
+    )
 
     #Generate ids
     ids = [f"doc_{i}" for i in range(len(documents))]
 
-    #Add documents (embeddings applied)
-    collection.add(documents=documents, metadatas=metadatas, ids=ids)
+    #Skip byte-identical documents
+    documents, metadatas, ids = dedupe_documents(documents, metadatas, ids)
+
+    #Batch-embed up front and hand Chroma the vectors, so add() never
+    #falls back to serial per-document HTTP calls
+    embeddings = embed_documents(documents)
+
+    collection.add(embeddings=embeddings, documents=documents, metadatas=metadatas, ids=ids)
     print(f"Indexed {len(documents)} documents into Chroma at {CHROMA_DIR}")
+    return collection
+
+
+def build_faiss_index(collection):
+    """
+    Export the full Chroma collection into a FAISS index for serving.
+
+    The backend prefers this index at query time (exact in-process search);
+    Chroma stays the source of truth for ingest-time persistence.
+    """
+    try:
+        from vectorstore.faiss_store import build_index
+    except ImportError:
+        print("faiss not installed; skipping FAISS index build.")
+        return
+
+    data = collection.get(include=["embeddings", "documents", "metadatas"])
+    if not data["ids"]:
+        print("Collection empty; skipping FAISS index build.")
+        return
+
+    build_index(data["embeddings"], data["documents"], data["metadatas"])
+    print(f"Built FAISS index with {len(data['ids'])} vectors")
 
 
 def ingest_slides(collection):
@@ -78,7 +274,7 @@ def ingest_slides(collection):
     Gets all presentations from Viven AI Google Drive folder and adds them to ChromaDB
     """
 
-    from integrations.google_slides import get_all_slides_content, is_authenticated
+    from integrations.google_slides import get_all_slides_content_async, is_authenticated
 
     #Auth Check
     if not is_authenticated():
@@ -86,9 +282,9 @@ def ingest_slides(collection):
         print("Please run the backend and go to http://localhost:8000/auth/login first.")
         return 0
 
-    #Fetch presentations
+    #Fetch presentations (all decks concurrently)
     print("\nFetching presentations from Viven AI folder...")
-    all_presentations = get_all_slides_content()
+    all_presentations = asyncio.run(get_all_slides_content_async())
 
     if not all_presentations:
         print("No presentations found.")
@@ -105,6 +301,11 @@ def ingest_slides(collection):
 
         print(f"\nProcessing: {source_name}")
 
+        #Slug is per-presentation, so build it once here (str.translate does
+        #both substitutions in a single C-level pass) instead of two
+        #str.replace calls per slide
+        safe_name = source_name.lower().translate(_SLUG_TABLE)
+
         for slide in presentation.get("slides", []):
             slide_num = slide.get("slide_number", 0)
             slide_title = slide.get("title", "")
@@ -126,15 +327,18 @@ def ingest_slides(collection):
             document_text = f"From '{source_name}', Slide {slide_num}:\n" + "\n".join(content_parts)
 
             #Create unique ID from ChromaDB
-            safe_name = source_name.lower().replace(" ", "-").replace("'", "")
             doc_id = f"slides_{safe_name}_slide_{slide_num}"
 
+            #Short content hash so reruns can tell changed slides apart
+            content_hash = hashlib.blake2b(document_text.encode(), digest_size=8).hexdigest()
+
             documents.append(document_text)
             metadatas.append({
                 "source": f"{source_name} (Slide {slide_num})",
                 "type": "slides",
                 "presentation": source_name,
                 "slide_number": slide_num,
+                "content_hash": content_hash,
             })
             ids.append(doc_id)
 
@@ -143,20 +347,42 @@ def ingest_slides(collection):
         print("No content found")
         return 0
 
-    #Remove old slides (prevent duplicates on rerun)
-    print("\nRemoving old slides data (if any)...")
-    try:
-        existing = collection.get(where={"type": "slides"})
-        old_ids = existing.get("ids", [])
-        if old_ids:
-            print(f"  Removing {len(old_ids)} old slide documents...")
-            collection.delete(ids=old_ids)
-    except Exception:
-        pass  #No old slides
+    #Skip byte-identical slides (template/title slides repeat across decks)
+    documents, metadatas, ids = dedupe_documents(documents, metadatas, ids)
+
+    #Diff against what's already indexed - slide IDs are deterministic, so
+    #we only need to touch slides whose content hash changed (or is new)
+    existing = collection.get(where={"type": "slides"}, include=["metadatas"])
+    existing_hashes = {
+        doc_id: meta.get("content_hash")
+        for doc_id, meta in zip(existing.get("ids", []), existing.get("metadatas", []))
+    }
+
+    #Slides that disappeared from the decks leave the index too
+    stale_ids = set(existing_hashes) - set(ids)
+    if stale_ids:
+        print(f"\nRemoving {len(stale_ids)} stale slide document(s)...")
+        collection.delete(ids=sorted(stale_ids))
+
+    changed = [
+        i for i, doc_id in enumerate(ids)
+        if existing_hashes.get(doc_id) != metadatas[i]["content_hash"]
+    ]
+    print(f"\nSlides: {len(ids)} total, {len(changed)} new/changed, {len(stale_ids)} removed")
+    if not changed:
+        return 0
 
-    #Add to ChromaDB
-    collection.add(documents=documents, metadatas=metadatas, ids=ids)
-    return len(documents)
+    changed_docs = [documents[i] for i in changed]
+
+    #Upsert only the changed slides with batch-computed embeddings
+    embeddings = embed_documents(changed_docs)
+    collection.upsert(
+        embeddings=embeddings,
+        documents=changed_docs,
+        metadatas=[metadatas[i] for i in changed],
+        ids=[ids[i] for i in changed],
+    )
+    return len(changed)
 
 
 if __name__ == '__main__':
@@ -168,18 +394,26 @@ if __name__ == '__main__':
     )
     args = parser.parse_args()
 
+    #Build the shared clients once - a PersistentClient reopens the
+    #sqlite/HNSW files and the embedding function owns an HTTP pool, so
+    #every ingest step reuses the same pair
+    embedding_fn = make_embedding_fn()
+    client = chromadb.PersistentClient(path=str(CHROMA_DIR))
+
     #Main ingestion
-    main()
+    collection = main(client, embedding_fn)
+    if collection is None:
+        #No profile docs - still need the collection handle for slides/FAISS
+        collection = client.get_or_create_collection(
+            name="profile",
+            embedding_function=embedding_fn,
+            metadata=_hnsw_params_for(0),
+        )
 
     #Slides
     if args.slides:
-        # Re-create the collection connection for slides
-        embedding_fn = embedding_functions.OpenAIEmbeddingFunction(
-            api_key=OPENAI_API_KEY,
-            model_name="text-embedding-3-small"
-        )
-        client = chromadb.PersistentClient(path=str(CHROMA_DIR))
-        collection = client.get_or_create_collection(name="profile", embedding_function=embedding_fn)
-
         slides_count = ingest_slides(collection)
-        print(f"\nIngested {slides_count} slide documents from Google Drive.")
\ No newline at end of file
+        print(f"\nIngested {slides_count} slide documents from Google Drive.")
+
+    #Export everything to FAISS for the serving path
+    build_faiss_index(collection)
\ No newline at end of file